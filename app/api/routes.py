@@ -2,12 +2,16 @@
 API Routes - All endpoints return dynamic data
 No hardcoded values
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Header, Depends
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from typing import List, Optional
+import asyncio
+import io
 import logging
+import threading
 from pathlib import Path
-import shutil
+import aiofiles
+from cachetools import TTLCache
 
 from app.services.data_service import DataService
 from app.services.model_service import ModelService
@@ -18,9 +22,115 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 config = get_config()
 
-# Initialize services
-data_service = DataService()
-model_service = ModelService()
+# Default session for clients that don't send a session header
+DEFAULT_SESSION_ID = "default"
+
+
+class SessionServices:
+    """Per-session service pair - keeps one client's state isolated"""
+
+    def __init__(self):
+        self.data_service = DataService()
+        self.model_service = ModelService()
+        # Serializes mutating requests within one session - the services
+        # themselves are not safe against concurrent modification
+        self.lock = asyncio.Lock()
+
+
+# Session registry - one SessionServices per X-Session-ID, evicted after 1h idle
+_sessions: TTLCache = TTLCache(maxsize=128, ttl=3600)
+_sessions_lock = threading.Lock()
+
+
+# Upload handling - bounded chunks so a large file can't exhaust memory
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+MAX_UPLOAD_SIZE = 100 << 20  # 100 MiB
+
+# Micro-batching for /api/predict - concurrent requests within the window
+# are coalesced so identical forecasts run once
+PREDICT_BATCH_MAX = 16
+PREDICT_BATCH_WINDOW = 0.01  # seconds
+
+_predict_queue: Optional[asyncio.Queue] = None
+_predict_worker_task: Optional[asyncio.Task] = None
+
+# Strong references to fire-and-forget tasks - the event loop only holds
+# weak references, so untracked tasks can be garbage-collected mid-run
+_background_tasks: set = set()
+
+
+def _spawn_background_task(coro) -> asyncio.Task:
+    """Create a task and keep it referenced until it completes"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+@router.on_event("startup")
+async def _start_predict_worker():
+    """Start the background worker that batches prediction requests"""
+    global _predict_queue, _predict_worker_task
+    _predict_queue = asyncio.Queue()
+    _predict_worker_task = asyncio.create_task(_predict_worker())
+
+
+async def _predict_worker():
+    """Pull prediction requests, coalesce a batch, demux results to callers"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _predict_queue.get()]
+        deadline = loop.time() + PREDICT_BATCH_WINDOW
+        while len(batch) < PREDICT_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_predict_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # Group identical (model, horizon) requests - one forecast serves all
+        groups = {}
+        for model_service, n_periods, future in batch:
+            key = (id(model_service), n_periods)
+            groups.setdefault(key, (model_service, n_periods, []))[2].append(future)
+
+        for model_service, n_periods, futures in groups.values():
+            try:
+                result = await model_service.predict(n_periods=n_periods)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for future in futures:
+                    if not future.done():
+                        future.set_result(result)
+
+
+async def _persist_upload(file_path: Path, raw: bytes) -> None:
+    """Write the uploaded bytes to disk in bounded chunks in the background"""
+    try:
+        async with aiofiles.open(file_path, "wb") as buffer:
+            view = memoryview(raw)
+            for start in range(0, len(view), UPLOAD_CHUNK_SIZE):
+                await buffer.write(view[start:start + UPLOAD_CHUNK_SIZE])
+    except Exception as e:
+        logger.error(f"Error persisting upload to {file_path}: {str(e)}")
+
+
+def get_session(x_session_id: Optional[str] = Header(None)) -> SessionServices:
+    """Resolve the services for this request's session, creating on first use"""
+    session_id = x_session_id or DEFAULT_SESSION_ID
+    with _sessions_lock:
+        session = _sessions.get(session_id)
+        if session is None:
+            session = SessionServices()
+        # Re-insert on every access - TTLCache expires a fixed TTL after
+        # insertion, so refreshing the entry makes eviction idle-based
+        _sessions[session_id] = session
+        return session
 
 
 @router.get("/api/config")
@@ -51,55 +161,74 @@ async def get_configuration():
 
 
 @router.post("/api/data/upload")
-async def upload_data(file: UploadFile = File(...)):
+async def upload_data(
+    file: UploadFile = File(...),
+    session: SessionServices = Depends(get_session)
+):
     """Upload CSV file - no hardcoded filename"""
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files allowed")
-    
+
     try:
         # Save file dynamically
         upload_dir = Path(config.data.upload_dir)
         upload_dir.mkdir(parents=True, exist_ok=True)
-        
+
         file_path = upload_dir / file.filename
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Load and process data
-        dataset_info = await data_service.load_data(str(file_path))
-        
+
+        # Read the upload in bounded chunks (rejecting oversized files) and
+        # parse from memory - the disk copy is only needed for later
+        # retraining, so persist it in the background
+        chunks = []
+        total = 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            total += len(chunk)
+            if total > MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large (max {MAX_UPLOAD_SIZE >> 20} MB)"
+                )
+            chunks.append(chunk)
+        raw = b"".join(chunks)
+        async with session.lock:
+            dataset_info = await session.data_service.load_data(
+                io.BytesIO(raw), file_path=str(file_path)
+            )
+        _spawn_background_task(_persist_upload(file_path, raw))
+
         return {
             "message": "File uploaded successfully",
             "filename": file.filename,
             "dataset_info": dataset_info
         }
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
 
 @router.get("/api/data/info")
-async def get_data_info():
+async def get_data_info(session: SessionServices = Depends(get_session)):
     """Get current dataset information - fetched from actual data"""
-    if not data_service.has_data():
+    if not session.data_service.has_data():
         return JSONResponse(
             status_code=404,
             content={"error": "No data loaded. Please upload a CSV file first."}
         )
-    
-    info = data_service.get_dataset_info()
+
+    info = session.data_service.get_dataset_info()
     return info
 
 
 @router.get("/api/data/stats")
-async def get_data_stats():
+async def get_data_stats(session: SessionServices = Depends(get_session)):
     """Get descriptive statistics"""
-    if not data_service.has_data():
+    if not session.data_service.has_data():
         raise HTTPException(status_code=404, detail="No data loaded")
-    
-    stats = data_service.get_descriptive_stats()
+
+    stats = session.data_service.get_descriptive_stats()
     return stats
 
 
@@ -107,21 +236,23 @@ async def get_data_stats():
 async def generate_features(
     columns: List[str] = Form(...),
     window1: int = Form(...),
-    window2: int = Form(...)
+    window2: int = Form(...),
+    session: SessionServices = Depends(get_session)
 ):
     """Generate features dynamically based on user input"""
-    if not data_service.has_data():
+    if not session.data_service.has_data():
         raise HTTPException(status_code=400, detail="No data loaded. Please upload data first.")
-    
+
     try:
         windows = [window1, window2]
-        features = await data_service.generate_rolling_features(
-            columns=columns,
-            windows=windows
-        )
-        
+        async with session.lock:
+            features = await session.data_service.generate_rolling_features(
+                columns=columns,
+                windows=windows
+            )
+
         return features
-        
+
     except Exception as e:
         logger.error(f"Error generating features: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -131,83 +262,94 @@ async def generate_features(
 async def train_model(
     train_split: float = Form(...),
     target_column: str = Form(...),
-    features: Optional[List[str]] = Form(None)
+    features: Optional[List[str]] = Form(None),
+    session: SessionServices = Depends(get_session)
 ):
     """Train model with dynamic parameters"""
-    if not data_service.has_data():
+    if not session.data_service.has_data():
         raise HTTPException(status_code=400, detail="No data loaded")
-    
+
     try:
-        # Split data dynamically
-        training_data, testing_data = data_service.split_data(
-            split_ratio=train_split,
-            method="date_based"
-        )
-        
-        # Use provided features or get from config
-        if features is None or len(features) == 0:
-            # Get generated features
-            if hasattr(data_service.feature_engineer, 'generated_features'):
-                features = data_service.feature_engineer.generated_features
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail="No features available. Please generate features first."
-                )
-        
-        # Train model
-        model_info = await model_service.train_arima(
-            training_data=training_data,
-            target_column=target_column,
-            features=features,
-            test_data=testing_data
-        )
-        
+        async with session.lock:
+            # Split data dynamically
+            training_data, testing_data = session.data_service.split_data(
+                split_ratio=train_split,
+                method="date_based"
+            )
+
+            # Use provided features or get from config
+            if features is None or len(features) == 0:
+                # Get generated features
+                if hasattr(session.data_service.feature_engineer, 'generated_features'):
+                    features = session.data_service.feature_engineer.generated_features
+                else:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="No features available. Please generate features first."
+                    )
+
+            # Train model
+            model_info = await session.model_service.train_arima(
+                training_data=training_data,
+                target_column=target_column,
+                features=features,
+                test_data=testing_data
+            )
+
         return model_info
-        
+
     except Exception as e:
         logger.error(f"Error training model: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/api/model/info")
-async def get_model_info():
+async def get_model_info(session: SessionServices = Depends(get_session)):
     """Get model information"""
-    if not model_service.has_trained_model():
+    if not session.model_service.has_trained_model():
         return JSONResponse(
             status_code=404,
             content={"error": "No model trained. Please train a model first."}
         )
-    
-    return model_service.get_model_info()
+
+    return session.model_service.get_model_info()
 
 
 @router.post("/api/predict")
 async def make_predictions(
-    n_periods: Optional[int] = Form(None)
+    n_periods: Optional[int] = Form(None),
+    session: SessionServices = Depends(get_session)
 ):
     """Make predictions - no hardcoded periods"""
-    if not model_service.has_trained_model():
+    if not session.model_service.has_trained_model():
         raise HTTPException(status_code=400, detail="No trained model available")
-    
+
     try:
-        predictions = await model_service.predict(n_periods=n_periods)
+        async with session.lock:
+            if _predict_queue is None:
+                # Worker not started (e.g. direct service use) - predict inline
+                predictions = await session.model_service.predict(n_periods=n_periods)
+            else:
+                future = asyncio.get_running_loop().create_future()
+                await _predict_queue.put((session.model_service, n_periods, future))
+                predictions = await future
         return predictions
-        
+
     except Exception as e:
         logger.error(f"Error making predictions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/api/metrics")
-async def get_metrics():
+async def get_metrics(session: SessionServices = Depends(get_session)):
     """Calculate metrics from actual predictions - no hardcoded values"""
+    model_service = session.model_service
     if not model_service.has_predictions():
         raise HTTPException(
             status_code=400,
             detail="No predictions available. Please make predictions first."
         )
-    
+
     try:
         # Check if we have both predictions and actual values
         if model_service.predictions is None or model_service.actual_values is None:
@@ -215,10 +357,10 @@ async def get_metrics():
                 status_code=400,
                 detail="Actual values are required for metrics calculation. Please make predictions on test data first."
             )
-        
+
         metrics = model_service.calculate_metrics()
         return metrics
-        
+
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
@@ -232,62 +374,93 @@ async def get_metrics():
 
 
 @router.get("/api/visualizations/vwap")
-async def get_vwap_chart(limit: Optional[int] = None):
+async def get_vwap_chart(
+    limit: Optional[int] = None,
+    session: SessionServices = Depends(get_session)
+):
     """Get VWAP chart data - from actual data"""
-    if not data_service.has_data():
+    if not session.data_service.has_data():
         raise HTTPException(status_code=404, detail="No data loaded")
-    
-    chart_data = data_service.get_vwap_chart_data(limit=limit)
-    return chart_data
+
+    chart_data = session.data_service.get_vwap_chart_data(limit=limit)
+    return ORJSONResponse(chart_data)
 
 
 @router.get("/api/visualizations/candlestick")
 async def get_candlestick_chart(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    session: SessionServices = Depends(get_session)
 ):
     """Get candlestick data - dynamic date range"""
-    if not data_service.has_data():
+    if not session.data_service.has_data():
         raise HTTPException(status_code=404, detail="No data loaded")
-    
+
     if limit is None:
         limit = config.visualization.default_candlestick_limit
-    
-    chart_data = data_service.get_candlestick_data(
+
+    chart_data = session.data_service.get_candlestick_data(
         start_date=start_date,
         end_date=end_date,
         limit=limit
     )
-    return chart_data
+    return ORJSONResponse(chart_data)
+
+
+@router.get("/api/visualizations/candlestick.arrow")
+async def get_candlestick_chart_arrow(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: Optional[int] = None,
+    session: SessionServices = Depends(get_session)
+):
+    """Get candlestick data as an Arrow IPC stream for large payloads"""
+    if not session.data_service.has_data():
+        raise HTTPException(status_code=404, detail="No data loaded")
+
+    if limit is None:
+        limit = config.visualization.default_candlestick_limit
+
+    payload = session.data_service.get_candlestick_arrow(
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit
+    )
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Required price columns not found")
+
+    return Response(content=payload, media_type="application/vnd.apache.arrow.stream")
 
 
 @router.get("/api/visualizations/price-trends")
-async def get_price_trends_chart(limit: Optional[int] = None):
+async def get_price_trends_chart(
+    limit: Optional[int] = None,
+    session: SessionServices = Depends(get_session)
+):
     """Get price trends data"""
-    if not data_service.has_data():
+    if not session.data_service.has_data():
         raise HTTPException(status_code=404, detail="No data loaded")
-    
-    chart_data = data_service.get_price_trends_data(limit=limit)
-    return chart_data
+
+    chart_data = session.data_service.get_price_trends_data(limit=limit)
+    return ORJSONResponse(chart_data)
 
 
 @router.get("/api/visualizations/vwap-distribution")
-async def get_vwap_distribution():
+async def get_vwap_distribution(session: SessionServices = Depends(get_session)):
     """Get VWAP distribution data"""
-    if not data_service.has_data():
+    if not session.data_service.has_data():
         raise HTTPException(status_code=404, detail="No data loaded")
-    
-    distribution_data = data_service.get_vwap_distribution_data()
-    return distribution_data
+
+    distribution_data = session.data_service.get_vwap_distribution_data()
+    return ORJSONResponse(distribution_data)
 
 
 @router.get("/api/visualizations/predictions")
-async def get_predictions_chart():
+async def get_predictions_chart(session: SessionServices = Depends(get_session)):
     """Get actual vs predicted chart - from real predictions"""
-    if not model_service.has_predictions():
+    if not session.model_service.has_predictions():
         raise HTTPException(status_code=404, detail="No predictions available")
-    
-    chart_data = model_service.get_predictions_chart_data()
-    return chart_data
 
+    chart_data = session.model_service.get_predictions_chart_data()
+    return chart_data
@@ -4,6 +4,7 @@ No hardcoded values allowed
 """
 from pydantic import BaseModel
 from typing import List, Dict, Any
+from functools import lru_cache
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -28,6 +29,7 @@ class ModelConfig(BaseModel):
     max_p: int = 5
     max_d: int = 2
     max_q: int = 5
+    max_concurrent_fits: int = 2
 
 
 class DataConfig(BaseModel):
@@ -53,10 +55,12 @@ class AppConfig(BaseModel):
     visualization: VisualizationConfig
 
 
+@lru_cache(maxsize=1)
 def get_config() -> AppConfig:
     """
     Load configuration from environment variables
     All values are dynamic - no hardcoded values
+    Cached so the AppConfig is built exactly once per process
     """
     # Feature configuration
     lag_features_str = os.getenv("LAG_FEATURES", "High,Low,Volume,Turnover")
@@ -108,9 +112,11 @@ def get_config() -> AppConfig:
                 "max_p": int(os.getenv("ARIMA_MAX_P", "5")),
                 "max_d": int(os.getenv("ARIMA_MAX_D", "2")),
                 "max_q": int(os.getenv("ARIMA_MAX_Q", "5")),
-                "trace": os.getenv("ARIMA_TRACE", "true").lower() == "true"
+                "trace": os.getenv("ARIMA_TRACE", "true").lower() == "true",
+                "parallel": os.getenv("ARIMA_PARALLEL", "false").lower() == "true"
             },
-            target_column=target_column
+            target_column=target_column,
+            max_concurrent_fits=int(os.getenv("ARIMA_MAX_CONCURRENT_FITS", "2"))
         ),
         data=DataConfig(
             required_columns=required_columns,
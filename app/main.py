@@ -4,12 +4,13 @@ FastAPI Main Application
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse, Response
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response
 import logging
 from pathlib import Path
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.api.routes import router
+from app.utils.rolling_numba import warmup_kernels
 
 # Configure logging
 logging.basicConfig(
@@ -21,7 +22,8 @@ logging.basicConfig(
 app = FastAPI(
     title="Stock Prediction API",
     description="Dynamic stock prediction API with no hardcoded values",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -36,6 +38,10 @@ app.add_middleware(
 # Serve frontend static files FIRST (before API routes)
 frontend_path = Path(__file__).parent.parent / "frontend"
 
+# Resolve HTML paths once at import time - no per-request Path joins
+INDEX_PATH = frontend_path / "index.html"
+DEBUG_PATH = frontend_path / "debug.html"
+
 # Custom middleware to add no-cache headers for JS files
 class NoCacheStaticFiles(StaticFiles):
     def __init__(self, *args, **kwargs):
@@ -44,17 +50,18 @@ class NoCacheStaticFiles(StaticFiles):
     async def __call__(self, scope, receive, send):
         async def send_wrapper(message):
             if message["type"] == "http.response.start":
-                # Add no-cache headers for JavaScript files
-                headers = dict(message.get("headers", []))
-                if b"content-type" in headers:
-                    content_type = headers[b"content-type"].decode()
-                    if "javascript" in content_type or "application/javascript" in content_type:
-                        headers[b"cache-control"] = b"no-cache, no-store, must-revalidate"
-                        headers[b"pragma"] = b"no-cache"
-                        headers[b"expires"] = b"0"
-                message["headers"] = list(headers.items())
+                # Add no-cache headers for JavaScript files only; forward
+                # everything else untouched (no dict round-trip per asset)
+                headers = message.get("headers", [])
+                for name, value in headers:
+                    if name == b"content-type":
+                        if b"javascript" in value:
+                            headers.append((b"cache-control", b"no-cache, no-store, must-revalidate"))
+                            headers.append((b"pragma", b"no-cache"))
+                            headers.append((b"expires", b"0"))
+                        break
             await send(message)
-        
+
         await super().__call__(scope, receive, send_wrapper)
 
 if frontend_path.exists():
@@ -64,33 +71,36 @@ if frontend_path.exists():
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve the main frontend application at root"""
-    index_path = frontend_path / "index.html"
-    if index_path.exists():
-        with open(index_path, 'r') as f:
-            return HTMLResponse(content=f.read())
+    if INDEX_PATH.exists():
+        return FileResponse(INDEX_PATH, media_type="text/html")
     return HTMLResponse(content="<h1>Stock Prediction API</h1><p>Frontend not found. <a href='/docs'>API Docs</a></p>", status_code=404)
 
 @app.get("/app", response_class=HTMLResponse)
 async def frontend_app():
     """Serve the main frontend application"""
-    index_path = frontend_path / "index.html"
-    if index_path.exists():
-        with open(index_path, 'r') as f:
-            return HTMLResponse(content=f.read())
+    if INDEX_PATH.exists():
+        return FileResponse(INDEX_PATH, media_type="text/html")
     return HTMLResponse(content="<h1>Frontend not found</h1>", status_code=404)
 
 @app.get("/debug.html", response_class=HTMLResponse)
 async def debug_page():
     """Debug page to test function loading"""
-    debug_path = frontend_path / "debug.html"
-    if debug_path.exists():
-        with open(debug_path, 'r') as f:
-            return HTMLResponse(content=f.read())
+    if DEBUG_PATH.exists():
+        return FileResponse(DEBUG_PATH, media_type="text/html")
     return HTMLResponse(content="<h1>Debug page not found</h1>", status_code=404)
 
 # Include API routes AFTER frontend routes
 app.include_router(router)
 
+@app.on_event("startup")
+async def warmup():
+    """Compile the Numba rolling kernels before the first request needs them
+
+    Runs synchronously on purpose: initializing Numba's threading layer from
+    a worker thread leaves the process hanging in native teardown at exit.
+    """
+    warmup_kernels()
+
 @app.get("/api")
 async def api_info():
     """API information endpoint"""
@@ -119,5 +129,14 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Single worker for local development - session state lives in-process,
+    # so multiple workers require sticky session routing (see README).
+    # uvloop/httptools still speed up the event loop and HTTP parsing.
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools"
+    )
 
@@ -1,8 +1,10 @@
 """
 Data service - Handles all data operations dynamically
 """
+import asyncio
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from typing import Dict, Optional, List, Tuple
 from pathlib import Path
 import logging
@@ -12,6 +14,9 @@ from app.config.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Cap on memoized chart payloads per service instance
+PAYLOAD_CACHE_MAX = 64
+
 
 class DataService:
     """Service for data operations"""
@@ -22,31 +27,53 @@ class DataService:
         self.config = get_config()
         self.current_data: Optional[pd.DataFrame] = None
         self.file_path: Optional[str] = None
+        # Snapshot of current_data's columns for O(1) membership checks
+        self._cols: frozenset = frozenset()
+        # VWAP distribution computed once per dataset, not per request
+        self._vwap_distribution: Optional[Dict] = None
+        # Dataset version counter - bumped whenever current_data is replaced
+        self._data_version: int = 0
+        self._info_cache: Optional[Tuple[int, Dict]] = None
+        # Memoized chart payloads keyed by (endpoint, version, args) so
+        # repeat dashboard polls are dict lookups
+        self._payload_cache: Dict = {}
     
-    async def load_data(self, file_path: str) -> Dict:
+    async def load_data(self, source, file_path: Optional[str] = None) -> Dict:
         """
-        Load data from file - dynamic file path
+        Load data from a file path or in-memory buffer
+        CPU-bound parsing runs in a worker thread so the event loop stays free
         """
+        return await asyncio.to_thread(self._load_data_sync, source, file_path)
+
+    def _load_data_sync(self, source, file_path: Optional[str] = None) -> Dict:
+        """Synchronous implementation of load_data"""
         try:
             # Ensure upload directory exists
             upload_dir = Path(self.config.data.upload_dir)
             upload_dir.mkdir(parents=True, exist_ok=True)
-            
+
             # Load CSV
-            df = self.data_loader.load_csv(file_path)
-            
+            df = self.data_loader.load_csv(source)
+
             # Prepare data
             data = self.data_loader.prepare_data(df, self.config.data.date_column)
-            
+
             self.current_data = data
-            self.file_path = file_path
-            
-            # Get dataset info
+            self._cols = frozenset(data.columns)
+            self._data_version += 1
+            # Drop memoized payloads - stale entries hold views into the
+            # superseded DataFrame and would pin it in memory
+            self._payload_cache.clear()
+            self.file_path = file_path if file_path else (source if isinstance(source, str) else None)
+            self._refresh_vwap_distribution()
+
+            # Get dataset info and prime the per-version cache
             info = self.data_loader.get_dataset_info(data)
-            
+            self._info_cache = (self._data_version, info)
+
             logger.info(f"Data loaded successfully: {info['total_rows']} rows")
             return info
-            
+
         except Exception as e:
             logger.error(f"Error loading data: {str(e)}")
             raise
@@ -56,11 +83,16 @@ class DataService:
         return self.current_data is not None
     
     def get_dataset_info(self) -> Dict:
-        """Get current dataset information"""
+        """Get current dataset information - cached per dataset version"""
         if not self.has_data():
             return {"error": "No data loaded"}
-        
-        return self.data_loader.get_dataset_info(self.current_data)
+
+        if self._info_cache and self._info_cache[0] == self._data_version:
+            return self._info_cache[1]
+
+        info = self.data_loader.get_dataset_info(self.current_data)
+        self._info_cache = (self._data_version, info)
+        return info
     
     def get_descriptive_stats(self) -> Dict:
         """Get descriptive statistics"""
@@ -77,10 +109,22 @@ class DataService:
     ) -> Dict:
         """
         Generate rolling features dynamically
+        Rolling computations run in a worker thread so the event loop stays free
         """
         if not self.has_data():
             raise ValueError("No data loaded. Please upload data first.")
-        
+
+        return await asyncio.to_thread(
+            self._generate_rolling_features_sync, columns, windows, operations
+        )
+
+    def _generate_rolling_features_sync(
+        self,
+        columns: List[str],
+        windows: List[int],
+        operations: List[str] = None
+    ) -> Dict:
+        """Synchronous implementation of generate_rolling_features"""
         # Generate features
         data_with_features = self.feature_engineer.generate_rolling_features(
             data=self.current_data,
@@ -91,6 +135,10 @@ class DataService:
         
         # Update current data
         self.current_data = data_with_features
+        self._cols = frozenset(data_with_features.columns)
+        self._data_version += 1
+        self._payload_cache.clear()
+        self._refresh_vwap_distribution()
         
         # Get feature info
         feature_info = self.feature_engineer.get_feature_info()
@@ -127,19 +175,68 @@ class DataService:
         if not self.has_data():
             return {"error": "No data loaded"}
         
-        if 'VWAP' not in self.current_data.columns:
+        if 'VWAP' not in self._cols:
             return {"error": "VWAP column not found"}
-        
-        data = self.current_data[['VWAP']].copy()
-        
+
+        key = ("vwap", self._data_version, limit)
+        return self._cached_payload(key, lambda: self._vwap_chart_payload(limit))
+
+    def _vwap_chart_payload(self, limit: Optional[int]) -> Dict:
+        """Build the VWAP chart payload"""
+        # Slice first, convert once - no intermediate DataFrame copy
+        vwap = self.current_data['VWAP']
         if limit:
-            data = data.tail(limit)
-        
+            vwap = vwap.tail(limit)
+
         return {
-            "dates": [str(idx) for idx in data.index],
-            "values": data['VWAP'].tolist()
+            "dates": vwap.index.values,
+            "values": vwap.to_numpy()
         }
     
+    def _cached_payload(self, key: Tuple, builder) -> Dict:
+        """Return the memoized payload for key, building it on first use"""
+        payload = self._payload_cache.get(key)
+        if payload is None:
+            payload = builder()
+            if len(self._payload_cache) >= PAYLOAD_CACHE_MAX:
+                self._payload_cache.clear()
+            self._payload_cache[key] = payload
+        return payload
+
+    def _slice_date_window(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Slice current_data to a date window via binary search when the index
+        is sorted - O(log N) instead of two full-length boolean masks.
+        Unsorted indices (e.g. a descending-date CSV) fall back to masks,
+        which are order-independent.
+        """
+        index = self.current_data.index
+
+        if not index.is_monotonic_increasing:
+            data = self.current_data
+            if start_date:
+                data = data[data.index >= pd.to_datetime(start_date)]
+            if end_date:
+                data = data[data.index <= pd.to_datetime(end_date)]
+            if limit:
+                data = data.tail(limit)
+            return data
+
+        i0 = index.searchsorted(pd.to_datetime(start_date), side='left') if start_date else 0
+        i1 = index.searchsorted(pd.to_datetime(end_date), side='right') if end_date else len(index)
+
+        # Apply limit - keep only the last `limit` rows of the window
+        if limit:
+            i0 = max(i0, i1 - limit)
+
+        # Row-slice before column selection so only `limit` rows are touched
+        return self.current_data.iloc[i0:i1]
+
     def get_candlestick_data(
         self,
         start_date: Optional[str] = None,
@@ -151,71 +248,125 @@ class DataService:
             return {"error": "No data loaded"}
         
         required_cols = ['Open', 'High', 'Low', 'Close']
-        missing_cols = [col for col in required_cols if col not in self.current_data.columns]
+        missing_cols = [col for col in required_cols if col not in self._cols]
         
         if missing_cols:
             return {"error": f"Missing columns: {missing_cols}"}
-        
-        data = self.current_data[required_cols].copy()
-        
-        # Apply date filters
-        if start_date:
-            data = data[data.index >= pd.to_datetime(start_date)]
-        if end_date:
-            data = data[data.index <= pd.to_datetime(end_date)]
-        
-        # Apply limit
-        if limit:
-            data = data.tail(limit)
-        
+
+        key = ("candlestick", self._data_version, start_date, end_date, limit)
+        return self._cached_payload(
+            key, lambda: self._candlestick_payload(start_date, end_date, limit)
+        )
+
+    def _candlestick_payload(
+        self,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        limit: Optional[int]
+    ) -> Dict:
+        """Build the candlestick chart payload"""
+        data = self._slice_date_window(start_date, end_date, limit)
+
         return {
-            "dates": [str(idx) for idx in data.index],
-            "open": data['Open'].tolist(),
-            "high": data['High'].tolist(),
-            "low": data['Low'].tolist(),
-            "close": data['Close'].tolist()
+            "dates": data.index.values,
+            "open": data['Open'].to_numpy(),
+            "high": data['High'].to_numpy(),
+            "low": data['Low'].to_numpy(),
+            "close": data['Close'].to_numpy()
         }
-    
+
+    def get_candlestick_arrow(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Optional[bytes]:
+        """Get candlestick data as an Arrow IPC stream - columnar binary transport"""
+        required_cols = ['Open', 'High', 'Low', 'Close']
+        if not self.has_data() or any(col not in self._cols for col in required_cols):
+            return None
+
+        data = self._slice_date_window(start_date, end_date, limit)
+
+        table = pa.table({
+            "dates": pa.array(data.index.values),
+            "open": pa.array(data['Open'].to_numpy()),
+            "high": pa.array(data['High'].to_numpy()),
+            "low": pa.array(data['Low'].to_numpy()),
+            "close": pa.array(data['Close'].to_numpy())
+        })
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
     def get_price_trends_data(self, limit: Optional[int] = None) -> Dict:
         """Get price trends data for OHLC chart"""
         if not self.has_data():
             return {"error": "No data loaded"}
         
         cols = ['Open', 'High', 'Low', 'Close']
-        available_cols = [col for col in cols if col in self.current_data.columns]
+        available_cols = [col for col in cols if col in self._cols]
         
         if not available_cols:
             return {"error": "No price columns found"}
-        
-        data = self.current_data[available_cols].copy()
-        
-        if limit:
-            data = data.tail(limit)
-        
+
+        key = ("price-trends", self._data_version, limit)
+        return self._cached_payload(
+            key, lambda: self._price_trends_payload(available_cols, limit)
+        )
+
+    def _price_trends_payload(self, available_cols: List[str], limit: Optional[int]) -> Dict:
+        """Build the price trends payload"""
+        # Slice rows first - no column copy of the full frame
+        data = self.current_data.tail(limit) if limit else self.current_data
+
         result = {
-            "dates": [str(idx) for idx in data.index]
+            "dates": data.index.values
         }
-        
+
         for col in available_cols:
-            result[col.lower()] = data[col].tolist()
-        
+            result[col.lower()] = data[col].to_numpy()
+
         return result
     
+    def _refresh_vwap_distribution(self) -> None:
+        """Recompute the VWAP distribution summary when the dataset changes"""
+        if 'VWAP' not in self._cols:
+            self._vwap_distribution = None
+            return
+
+        vwap_values = self.current_data['VWAP'].to_numpy(dtype=np.float64)
+        vwap_values = vwap_values[~np.isnan(vwap_values)]
+
+        # All-NaN/empty column: reductions would raise, serve an empty payload
+        if vwap_values.size == 0:
+            self._vwap_distribution = {
+                "values": vwap_values,
+                "mean": None,
+                "std": None,
+                "min": None,
+                "max": None
+            }
+            return
+
+        self._vwap_distribution = {
+            "values": vwap_values,
+            "mean": float(vwap_values.mean()),
+            "std": float(vwap_values.std(ddof=1)),
+            "min": float(vwap_values.min()),
+            "max": float(vwap_values.max())
+        }
+
     def get_vwap_distribution_data(self) -> Dict:
         """Get VWAP distribution data for histogram"""
         if not self.has_data():
             return {"error": "No data loaded"}
-        
-        if 'VWAP' not in self.current_data.columns:
+
+        if self._vwap_distribution is None:
             return {"error": "VWAP column not found"}
-        
-        vwap_data = self.current_data['VWAP'].dropna()
-        
-        return {
-            "values": vwap_data.tolist(),
-            "mean": float(vwap_data.mean()),
-            "std": float(vwap_data.std()),
-            "min": float(vwap_data.min()),
-            "max": float(vwap_data.max())
-        }
+
+        return self._vwap_distribution
 
@@ -1,17 +1,52 @@
 """
 Model service - Handles model training and management dynamically
 """
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
 import pandas as pd
 import numpy as np
 from typing import Dict, Optional, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import logging
-import pickle
+import joblib
 from pathlib import Path
 from pmdarima import auto_arima
 from app.config.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Series length beyond which the ARIMA search switches to a cheaper
+# approximate fit (mirrors R auto.arima's approximation default)
+APPROXIMATION_THRESHOLD = 150
+
+# Process pool shared by all model fits - bypasses the GIL so concurrent
+# trains proceed in parallel without stalling the event loop
+_fit_executor: Optional[ProcessPoolExecutor] = None
+_fit_executor_lock = threading.Lock()
+
+
+def _get_fit_executor(max_workers: int) -> ProcessPoolExecutor:
+    """Lazily create the shared fit executor"""
+    global _fit_executor
+    with _fit_executor_lock:
+        if _fit_executor is None:
+            # spawn rather than fork - the parent runs Numba's threading
+            # layer, which forked children inherit in an invalid state
+            _fit_executor = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, max_workers),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _fit_executor
+
+
+def _fit_auto_arima(y, X, fit_kwargs):
+    """Run the auto_arima search - module-level so it pickles to the pool"""
+    return auto_arima(y=y, X=X, **fit_kwargs)
+
 
 class ModelService:
     """Service for model operations"""
@@ -22,8 +57,9 @@ class ModelService:
         self.model_info: Dict = {}
         self.training_data: Optional[pd.DataFrame] = None
         self.testing_data: Optional[pd.DataFrame] = None
-        self.predictions: Optional[pd.Series] = None
-        self.actual_values: Optional[pd.Series] = None
+        self.predictions: Optional[np.ndarray] = None
+        self.prediction_dates: Optional[List[str]] = None
+        self.actual_values: Optional[np.ndarray] = None
     
     async def train_arima(
         self,
@@ -45,25 +81,58 @@ class ModelService:
             if missing_features:
                 raise ValueError(f"Features not found: {missing_features}")
             
-            # Extract target and features
-            y = training_data[target_column]
-            X = training_data[features] if features else None
+            # Extract target and features as plain float64 ndarrays - the
+            # stored frames are float32 (memory) but the fit runs in float64
+            # for stability, and pmdarima's un-differencing prediction path
+            # mishandles pandas confidence intervals under simple_differencing
+            y = training_data[target_column].to_numpy(dtype=np.float64)
+            X = training_data[features].to_numpy(dtype=np.float64) if features else None
             
             logger.info(f"Training ARIMA model with {len(y)} samples, {len(features) if features else 0} features")
             
             # Get ARIMA parameters from config
             arima_params = self.config.model.auto_arima_params
-            
-            # Train model
-            model = auto_arima(
-                y=y,
-                X=X,
-                trace=arima_params.get("trace", True),
-                max_p=arima_params.get("max_p", 5),
-                max_d=arima_params.get("max_d", 2),
-                max_q=arima_params.get("max_q", 5),
-                seasonal=False,
-                stepwise=True
+
+            # Long series get an approximate search: conditional
+            # (simple-differencing) likelihood, a tighter optimizer budget
+            # and no per-candidate trace printing. pmdarima has no direct
+            # equivalent of R auto.arima's approximation flag, so this
+            # emulates it.
+            approximate = len(y) > APPROXIMATION_THRESHOLD
+            if approximate:
+                logger.info(f"Series length {len(y)} > {APPROXIMATION_THRESHOLD}, using approximate ARIMA search")
+
+            max_p = arima_params.get("max_p", 5)
+            max_q = arima_params.get("max_q", 5)
+
+            fit_kwargs = {
+                "trace": False if approximate else arima_params.get("trace", True),
+                "max_p": max_p,
+                "max_d": arima_params.get("max_d", 2),
+                "max_q": max_q,
+                "seasonal": False,
+                "stepwise": True,
+                "maxiter": 30 if approximate else 50,
+                "sarimax_kwargs": {"simple_differencing": True} if approximate else None
+            }
+
+            # Optional parallel grid search: trades stepwise's adaptive
+            # pruning for concurrent candidate fits - worthwhile when cores
+            # are plentiful and the (p, q) grid is large
+            if arima_params.get("parallel", False):
+                fit_kwargs.update(
+                    stepwise=False,
+                    n_jobs=min(os.cpu_count() or 1, max_p * max_q),
+                    trace=False
+                )
+                logger.info(f"Parallel ARIMA grid search enabled with n_jobs={fit_kwargs['n_jobs']}")
+
+            # Train in the process pool - the search is CPU-bound and would
+            # otherwise block the event loop for its whole duration
+            loop = asyncio.get_running_loop()
+            model = await loop.run_in_executor(
+                _get_fit_executor(self.config.model.max_concurrent_fits),
+                partial(_fit_auto_arima, y, X, fit_kwargs)
             )
             
             self.model = model
@@ -84,8 +153,7 @@ class ModelService:
                 "training_rows": len(training_data),
                 "testing_rows": len(test_data) if test_data is not None else 0,
                 "features_used": features,
-                "target_column": target_column,
-                "model_summary": str(model.summary()) if hasattr(model, 'summary') else None
+                "target_column": target_column
             }
             
             logger.info(f"Model trained successfully: ARIMA{order}, AIC: {self.model_info['aic']}")
@@ -102,9 +170,16 @@ class ModelService:
     
     def get_model_info(self) -> Dict:
         """Get current model information"""
-        if not self.has_trained_model():
+        if self.model is None:
             return {"error": "No model trained"}
-        
+
+        # Rendering the statsmodels summary table is expensive, so it is
+        # built lazily on the first info request and cached thereafter
+        if "model_summary" not in self.model_info:
+            self.model_info["model_summary"] = (
+                str(self.model.summary()) if hasattr(self.model, 'summary') else None
+            )
+
         return self.model_info
     
     async def predict(
@@ -115,7 +190,9 @@ class ModelService:
         """
         Make predictions dynamically
         """
-        if not self.has_trained_model():
+        # Direct attribute check - these guards run on every request, and
+        # has_trained_model() is kept for external callers only
+        if self.model is None:
             raise ValueError("No trained model available")
         
         # Determine number of periods
@@ -129,7 +206,8 @@ class ModelService:
         if X is None and self.testing_data is not None:
             features = self.model_info.get("features_used", [])
             if features:
-                X = self.testing_data[features]
+                # Match the float64 ndarray form the model was fitted with
+                X = self.testing_data[features].to_numpy(dtype=np.float64)
         
         # Make predictions
         try:
@@ -145,29 +223,38 @@ class ModelService:
             nan_count = np.isnan(forecast_array).sum() if len(forecast_array) > 0 else 0
             logger.info(f"Forecast generated: {len(forecast_array)} values, NaN count: {nan_count}")
             
-            # Get dates
+            # Get dates - one vectorized strftime pass, not a str() per row
             if self.testing_data is not None:
-                dates = [str(idx) for idx in self.testing_data.index[:n_periods]]
-                actual = self.testing_data[self.model_info["target_column"]].iloc[:n_periods].tolist()
-                
-                # Check for NaN in actual values
-                actual_nan_count = sum(1 for v in actual if (isinstance(v, (int, float)) and pd.isna(v)) or (not isinstance(v, (int, float)) and v is None))
-                logger.info(f"Actual values: {len(actual)} values, NaN count: {actual_nan_count}")
+                test_index = self.testing_data.index[:n_periods]
+                if isinstance(test_index, pd.DatetimeIndex):
+                    dates = test_index.strftime('%Y-%m-%d %H:%M:%S').tolist()
+                else:
+                    dates = test_index.astype(str).tolist()
+                actual_arr = self.testing_data[self.model_info["target_column"]].iloc[:n_periods].to_numpy(dtype=np.float64)
+
+                # Check for NaN in actual values - one vectorized pass
+                actual_nan_count = int(np.isnan(actual_arr).sum())
+                logger.info(f"Actual values: {len(actual_arr)} values, NaN count: {actual_nan_count}")
+
             else:
-                # Generate future dates
+                actual_arr = None
+                # Generate future dates - build the range once and format it
+                # in a single pass (the old comprehension rebuilt the whole
+                # range per element, quadratic in the horizon)
                 last_date = self.training_data.index[-1]
-                dates = [str(pd.date_range(start=last_date, periods=n_periods+1, freq='D')[1:][i]) 
-                        for i in range(n_periods)]
-                actual = None
-            
-            self.predictions = pd.Series(forecast_array, index=dates if dates else range(n_periods))
-            if actual:
-                self.actual_values = pd.Series(actual, index=dates)
-            
+                future_index = pd.date_range(start=last_date, periods=n_periods + 1, freq='D')[1:]
+                dates = future_index.strftime('%Y-%m-%d %H:%M:%S').tolist()
+
+            # Keep the raw ndarrays as the single source of truth and
+            # convert to Python lists exactly once for the response
+            self.predictions = forecast_array
+            self.prediction_dates = dates
+            self.actual_values = actual_arr
+
             return {
-                "values": forecast.tolist() if hasattr(forecast, 'tolist') else list(forecast),
+                "values": forecast_array.tolist(),
                 "dates": dates,
-                "actual": actual,
+                "actual": actual_arr.tolist() if actual_arr is not None else None,
                 "n_periods": n_periods
             }
             
@@ -182,19 +269,10 @@ class ModelService:
         if self.predictions is None or self.actual_values is None:
             raise ValueError("Predictions and actual values required for metrics")
         
-        from sklearn.metrics import mean_absolute_error, mean_squared_error
-        
-        # Extract values first, handling different types
+        # Extract values first - asarray is a no-op for the stored ndarrays
         try:
-            if isinstance(self.predictions, pd.Series):
-                pred_values = self.predictions.values
-            else:
-                pred_values = np.array(self.predictions)
-            
-            if isinstance(self.actual_values, pd.Series):
-                actual_values = self.actual_values.values
-            else:
-                actual_values = np.array(self.actual_values)
+            pred_values = np.asarray(self.predictions)
+            actual_values = np.asarray(self.actual_values)
         except Exception as e:
             logger.error(f"Error extracting values: {str(e)}")
             raise ValueError(f"Error extracting values: {str(e)}")
@@ -215,62 +293,57 @@ class ModelService:
             logger.error(f"Error converting to numeric: {str(e)}")
             raise ValueError(f"Error converting to numeric: {str(e)}")
         
-        # Remove NaN and inf values from both arrays
-        valid_mask = np.isfinite(pred_values) & np.isfinite(actual_values)
-        
-        # Log diagnostic information
-        nan_pred_count = np.isnan(pred_values).sum() if len(pred_values) > 0 else 0
-        nan_actual_count = np.isnan(actual_values).sum() if len(actual_values) > 0 else 0
-        inf_pred_count = np.isinf(pred_values).sum() if len(pred_values) > 0 else 0
-        inf_actual_count = np.isinf(actual_values).sum() if len(actual_values) > 0 else 0
-        valid_count = np.sum(valid_mask) if len(valid_mask) > 0 else 0
-        
-        logger.info(f"Metrics calculation - Total: {len(pred_values)}, Valid: {valid_count}, "
-                   f"NaN (pred/actual): {nan_pred_count}/{nan_actual_count}, "
-                   f"Inf (pred/actual): {inf_pred_count}/{inf_actual_count}")
-        
-        if not np.any(valid_mask):
+        # Remove NaN and inf values from both arrays - one finiteness pass
+        # per array, with all diagnostic counts derived from the masks
+        pred_finite = np.isfinite(pred_values)
+        actual_finite = np.isfinite(actual_values)
+        valid_mask = pred_finite & actual_finite
+
+        total = len(pred_values)
+        valid_count = int(valid_mask.sum())
+        invalid_pred_count = total - int(pred_finite.sum())
+        invalid_actual_count = total - int(actual_finite.sum())
+
+        logger.info(f"Metrics calculation - Total: {total}, Valid: {valid_count}, "
+                   f"Non-finite (pred/actual): {invalid_pred_count}/{invalid_actual_count}")
+
+        if valid_count == 0:
             error_msg = (f"No valid (finite) predictions and actual values available. "
-                        f"Total values: {len(pred_values)}, "
-                        f"NaN in predictions: {nan_pred_count}, "
-                        f"NaN in actual: {nan_actual_count}, "
-                        f"Inf in predictions: {inf_pred_count}, "
-                        f"Inf in actual: {inf_actual_count}")
+                        f"Total values: {total}, "
+                        f"Non-finite in predictions: {invalid_pred_count}, "
+                        f"Non-finite in actual: {invalid_actual_count}")
             logger.error(error_msg)
             raise ValueError(error_msg)
-        
+
         pred_clean = pred_values[valid_mask]
         actual_clean = actual_values[valid_mask]
-        
-        if len(pred_clean) == 0:
-            raise ValueError("No valid predictions and actual values after filtering NaN/inf")
-        
-        # Final check: ensure no NaN/inf remain
-        if np.any(~np.isfinite(pred_clean)) or np.any(~np.isfinite(actual_clean)):
-            logger.error("NaN/inf values still present after filtering")
-            raise ValueError("NaN/inf values still present after filtering")
-        
-        # Calculate metrics
-        try:
-            mse = mean_squared_error(actual_clean, pred_clean)
-            rmse = np.sqrt(mse)
-            mae = mean_absolute_error(actual_clean, pred_clean)
-        except Exception as e:
-            logger.error(f"Error calculating metrics: {str(e)}")
-            raise ValueError(f"Error calculating metrics: {str(e)}")
-        
-        # Calculate MAPE (handle division by zero)
+
+        # Calculate metrics with direct NumPy reductions - the arrays are
+        # already validated float64, so sklearn's input checks are pure cost
+        diff = actual_clean - pred_clean
+        mse = float(np.dot(diff, diff) / diff.size)
+        rmse = math.sqrt(mse)
+        mae = float(np.abs(diff).mean())
+
+        # Calculate MAPE (handle division by zero) - computed in one
+        # pre-allocated buffer with a masked divide instead of three
+        # fancy-indexed temporaries
         non_zero_mask = np.abs(actual_clean) > 1e-10
         if np.any(non_zero_mask):
-            mape = np.mean(np.abs((actual_clean[non_zero_mask] - pred_clean[non_zero_mask]) / actual_clean[non_zero_mask])) * 100
+            out = np.empty_like(actual_clean)
+            np.subtract(actual_clean, pred_clean, out=out)
+            np.abs(out, out=out)
+            np.divide(out, actual_clean, out=out, where=non_zero_mask)
+            mape = float(out[non_zero_mask].mean() * 100)
         else:
             mape = None  # All actual values are zero, MAPE is undefined
         
-        # Calculate directional accuracy
+        # Calculate directional accuracy - compare sign bits of the diffs in
+        # one expression so no boolean temporaries outlive the reduction
         if len(actual_clean) > 1:
-            actual_direction = np.diff(actual_clean) > 0
-            pred_direction = np.diff(pred_clean) > 0
-            directional_accuracy = np.mean(actual_direction == pred_direction) * 100
+            directional_accuracy = np.mean(
+                np.signbit(np.diff(actual_clean)) == np.signbit(np.diff(pred_clean))
+            ) * 100
         else:
             directional_accuracy = None
         
@@ -290,9 +363,10 @@ class ModelService:
         """Get data for predictions chart"""
         if self.predictions is None:
             return {"error": "No predictions available"}
-        
+
+        # The dates were already formatted once in predict()
         result = {
-            "dates": [str(idx) for idx in self.predictions.index],
+            "dates": self.prediction_dates,
             "predicted": self.predictions.tolist()
         }
         
@@ -309,15 +383,21 @@ class ModelService:
             
             model_dir = Path(file_path).parent
             model_dir.mkdir(parents=True, exist_ok=True)
-            
-            with open(file_path, 'wb') as f:
-                pickle.dump({
-                    'model': self.model,
-                    'model_info': self.model_info,
-                    'training_data': self.training_data,
-                    'testing_data': self.testing_data
-                }, f)
-            
+
+            # Model + metadata via joblib (lz4-compressed, PEP 574 buffers);
+            # the DataFrames go to Parquet side files instead of being
+            # pickled as Python object graphs
+            joblib.dump(
+                {'model': self.model, 'model_info': self.model_info},
+                file_path,
+                compress=('lz4', 3),
+                protocol=5
+            )
+            if self.training_data is not None:
+                self.training_data.to_parquet(f"{file_path}.train.parquet")
+            if self.testing_data is not None:
+                self.testing_data.to_parquet(f"{file_path}.test.parquet")
+
             logger.info(f"Model saved to {file_path}")
             return True
             
@@ -328,13 +408,15 @@ class ModelService:
     def load_model(self, file_path: str) -> bool:
         """Load model from file"""
         try:
-            with open(file_path, 'rb') as f:
-                data = pickle.load(f)
-                self.model = data['model']
-                self.model_info = data['model_info']
-                self.training_data = data.get('training_data')
-                self.testing_data = data.get('testing_data')
-            
+            data = joblib.load(file_path)
+            self.model = data['model']
+            self.model_info = data['model_info']
+
+            train_path = Path(f"{file_path}.train.parquet")
+            test_path = Path(f"{file_path}.test.parquet")
+            self.training_data = pd.read_parquet(train_path) if train_path.exists() else None
+            self.testing_data = pd.read_parquet(test_path) if test_path.exists() else None
+
             logger.info(f"Model loaded from {file_path}")
             return True
             
@@ -3,12 +3,17 @@ Data loading utilities - No hardcoded file paths or values
 """
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 from typing import Dict, Optional, List
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Block size for the multi-threaded Arrow CSV reader (8 MiB)
+CSV_BLOCK_SIZE = 8 << 20
+
 
 class DataLoader:
     """Dynamic data loading and cleaning"""
@@ -16,17 +21,45 @@ class DataLoader:
     def __init__(self, date_column: str = "Date"):
         self.date_column = date_column
         self.data: Optional[pd.DataFrame] = None
+        # Version counter bumped on prepare_data - keys the info/stats caches
+        self._version: int = 0
+        self._info_cache: Dict[int, Dict] = {}
+        self._stats_cache: Dict[int, Dict] = {}
     
-    def load_csv(self, file_path: str) -> pd.DataFrame:
+    def load_csv(self, source) -> pd.DataFrame:
         """
-        Load CSV file dynamically - no hardcoded filename
+        Load CSV dynamically from a file path or in-memory buffer
         """
         try:
-            df = pd.read_csv(file_path)
-            logger.info(f"Loaded data from {file_path}: {len(df)} rows, {len(df.columns)} columns")
+            # Multi-threaded Arrow parse, zero-copied into pandas; the date
+            # column is typed up-front so it parses in C during the scan
+            # instead of via pd.to_datetime afterwards
+            read_options = pa_csv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE)
+            convert_options = pa_csv.ConvertOptions(
+                column_types={self.date_column: pa.timestamp('ns')},
+                timestamp_parsers=[pa_csv.ISO8601, '%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y']
+            )
+            try:
+                table = pa_csv.read_csv(
+                    source,
+                    read_options=read_options,
+                    convert_options=convert_options
+                )
+            except pa.ArrowInvalid:
+                # Unrecognized date format - reparse untyped and let
+                # prepare_data coerce the dates
+                if hasattr(source, 'seek'):
+                    source.seek(0)
+                table = pa_csv.read_csv(source, read_options=read_options)
+            # split_blocks + self_destruct releases each Arrow buffer as its
+            # pandas block is built, so the table and frame never coexist in
+            # full and peak RSS stays near one copy of the data
+            df = table.to_pandas(split_blocks=True, self_destruct=True)
+            del table
+            logger.info(f"Loaded data: {len(df)} rows, {len(df.columns)} columns")
             return df
         except Exception as e:
-            logger.error(f"Error loading file {file_path}: {str(e)}")
+            logger.error(f"Error loading {source}: {str(e)}")
             raise
     
     def prepare_data(self, df: pd.DataFrame, date_column: str = None) -> pd.DataFrame:
@@ -51,13 +84,27 @@ class DataLoader:
                 data = data.drop(columns=['Trades'], axis=1)
                 logger.info("Dropped 'Trades' column due to NaN values")
         
-        # Remove duplicates
-        duplicates = data.duplicated().sum()
-        if duplicates > 0:
+        # Remove duplicates - .any() short-circuits on the first hit, so the
+        # common zero-duplicate case skips the full count
+        if data.duplicated().any():
+            before = len(data)
             data = data.drop_duplicates()
-            logger.info(f"Removed {duplicates} duplicate rows")
-        
+            logger.info(f"Removed {before - len(data)} duplicate rows")
+
+        # Downcast to float32 and categorize low-cardinality strings - halves
+        # memory bandwidth for the downstream rolling and statistics passes
+        float_cols = data.select_dtypes(include=['float64']).columns
+        if len(float_cols) > 0:
+            data[float_cols] = data[float_cols].astype(np.float32)
+
+        for col in data.select_dtypes(include=['object']).columns:
+            if data[col].nunique() <= len(data) // 2:
+                data[col] = data[col].astype('category')
+
         self.data = data
+        self._version += 1
+        self._info_cache.clear()
+        self._stats_cache.clear()
         return data
     
     def get_dataset_info(self, df: Optional[pd.DataFrame] = None) -> Dict:
@@ -65,10 +112,15 @@ class DataLoader:
         Get dataset information dynamically
         """
         data = df if df is not None else self.data
-        
+
         if data is None:
             return {}
-        
+
+        # Serve the cached info while the prepared dataset is unchanged
+        cacheable = data is self.data
+        if cacheable and self._version in self._info_cache:
+            return self._info_cache[self._version]
+
         numeric_cols = list(data.select_dtypes(include=[np.number]).columns)
         
         info = {
@@ -83,7 +135,10 @@ class DataLoader:
             "missing_values": data.isna().sum().to_dict(),
             "dtypes": {col: str(dtype) for col, dtype in data.dtypes.items()}
         }
-        
+
+        if cacheable:
+            self._info_cache[self._version] = info
+
         return info
     
     def get_descriptive_stats(self, df: Optional[pd.DataFrame] = None) -> Dict:
@@ -91,10 +146,20 @@ class DataLoader:
         Get descriptive statistics dynamically
         """
         data = df if df is not None else self.data
-        
+
         if data is None:
             return {}
-        
+
+        # Serve the cached stats while the prepared dataset is unchanged
+        cacheable = data is self.data
+        if cacheable and self._version in self._stats_cache:
+            return self._stats_cache[self._version]
+
         numeric_data = data.select_dtypes(include=[np.number])
-        return numeric_data.describe().to_dict()
+        stats = numeric_data.describe().to_dict()
+
+        if cacheable:
+            self._stats_cache[self._version] = stats
+
+        return stats
 
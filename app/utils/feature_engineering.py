@@ -5,10 +5,26 @@ No hardcoded window sizes, columns, or feature names
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional
+from functools import lru_cache
 import logging
+from app.utils.rolling_numba import (
+    rolling_mean_table,
+    rolling_std_table,
+    rolling_min_table,
+    rolling_max_table,
+    rolling_mean_std_table
+)
 
 logger = logging.getLogger(__name__)
 
+# Map operation names to their table-wise jitted kernels
+ROLLING_KERNELS = {
+    'mean': rolling_mean_table,
+    'std': rolling_std_table,
+    'min': rolling_min_table,
+    'max': rolling_max_table
+}
+
 
 class FeatureEngineer:
     """Dynamic feature engineering"""
@@ -38,45 +54,60 @@ class FeatureEngineer:
         """
         if operations is None:
             operations = ['mean', 'std']
-        
-        dataframe = data.copy()
+
         feature_names = []
-        
+        feature_arrays = {}
+
+        valid_cols = []
         for col in columns:
-            if col not in dataframe.columns:
+            if col not in data.columns:
                 logger.warning(f"Column '{col}' not found, skipping")
                 continue
-            
+            valid_cols.append(col)
+
+        if valid_cols:
+            # Extract all columns once, column-major (structure-of-arrays) so
+            # each parallel kernel worker streams a contiguous column
+            values = np.asfortranarray(data[valid_cols].to_numpy(dtype=np.float64))
+
+            # mean+std (the default) share one fused pass per window so the
+            # column data is only read from memory once
+            fuse_mean_std = 'mean' in operations and 'std' in operations
+
             for window in windows:
+                fused = rolling_mean_std_table(values, window) if fuse_mean_std else None
                 for operation in operations:
-                    if operation == 'mean':
-                        feature_name = f"{col}_rolling_mean_{window}"
-                        dataframe[feature_name] = dataframe[col].rolling(window=window).mean()
-                        feature_names.append(feature_name)
-                    elif operation == 'std':
-                        feature_name = f"{col}_rolling_std_{window}"
-                        dataframe[feature_name] = dataframe[col].rolling(window=window).std()
-                        feature_names.append(feature_name)
-                    elif operation == 'min':
-                        feature_name = f"{col}_rolling_min_{window}"
-                        dataframe[feature_name] = dataframe[col].rolling(window=window).min()
-                        feature_names.append(feature_name)
-                    elif operation == 'max':
-                        feature_name = f"{col}_rolling_max_{window}"
-                        dataframe[feature_name] = dataframe[col].rolling(window=window).max()
+                    if fused is not None and operation in ('mean', 'std'):
+                        table = fused[0] if operation == 'mean' else fused[1]
+                    else:
+                        kernel = ROLLING_KERNELS.get(operation)
+                        if kernel is None:
+                            logger.warning(f"Unknown operation '{operation}', skipping")
+                            continue
+                        table = kernel(values, window)
+                    for j, col in enumerate(valid_cols):
+                        feature_name = f"{col}_rolling_{operation}_{window}"
+                        feature_arrays[feature_name] = table[:, j]
                         feature_names.append(feature_name)
-        
-        # Drop rows with NaN values created by rolling windows
-        initial_rows = len(dataframe)
-        dataframe.dropna(inplace=True)
-        dropped_rows = initial_rows - len(dataframe)
-        
-        if dropped_rows > 0:
-            logger.info(f"Dropped {dropped_rows} rows with NaN values after feature engineering")
-        
+
+        # Attach all features with a single concat instead of per-column
+        # inserts that each re-consolidate the block manager
+        if feature_arrays:
+            new_features = pd.DataFrame(feature_arrays, index=data.index)
+            dataframe = pd.concat([data, new_features], axis=1, copy=False)
+
+            # The rolling warm-up region is deterministic - slice it off
+            # instead of scanning every cell with dropna
+            warmup_rows = max(windows) - 1
+            if warmup_rows > 0:
+                dataframe = dataframe.iloc[warmup_rows:]
+                logger.info(f"Dropped {warmup_rows} rolling warm-up rows after feature engineering")
+        else:
+            dataframe = data
+
         self.data = dataframe
         self.generated_features = feature_names
-        
+
         return dataframe
     
     def get_feature_info(self) -> Dict:
@@ -108,17 +139,23 @@ class FeatureEngineer:
     ) -> List[str]:
         """
         Get list of feature names that would be generated
-        Without actually generating them
+        Without actually generating them - memoized per argument combination
         """
         if operations is None:
             operations = ['mean', 'std']
-        
-        feature_names = []
-        for col in columns:
-            for window in windows:
-                for operation in operations:
-                    feature_name = f"{col}_rolling_{operation}_{window}"
-                    feature_names.append(feature_name)
-        
-        return feature_names
+
+        return list(_rolling_feature_names(
+            tuple(columns), tuple(windows), tuple(operations)
+        ))
+
+
+@lru_cache(maxsize=128)
+def _rolling_feature_names(columns: tuple, windows: tuple, operations: tuple) -> tuple:
+    """Build the feature name tuple - pure function of its arguments"""
+    return tuple(
+        f"{col}_rolling_{operation}_{window}"
+        for col in columns
+        for window in windows
+        for operation in operations
+    )
 
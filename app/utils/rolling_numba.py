@@ -0,0 +1,227 @@
+"""
+Numba-jitted rolling window kernels - O(N) running accumulators
+Replaces pandas .rolling() calls in the feature engineering hot path
+"""
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def rolling_mean(arr, window):
+    """Rolling mean via a running sum - one pass, O(N)"""
+    n = arr.shape[0]
+    out = np.full(n, np.nan)
+    s = 0.0
+    nan_count = 0
+    for i in range(n):
+        x = arr[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            s += x
+        if i >= window:
+            y = arr[i - window]
+            if np.isnan(y):
+                nan_count -= 1
+            else:
+                s -= y
+        if i >= window - 1 and nan_count == 0:
+            out[i] = s / window
+    return out
+
+
+@njit(cache=True)
+def rolling_std(arr, window):
+    """Rolling sample std via Welford running moments - one pass
+
+    Tracks the window mean and centered second moment (M2) with add/remove
+    updates, avoiding the catastrophic cancellation of the naive
+    sum-of-squares formula on near-constant data.
+    """
+    n = arr.shape[0]
+    out = np.full(n, np.nan)
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    nan_count = 0
+    for i in range(n):
+        x = arr[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            count += 1
+            d = x - mean
+            mean += d / count
+            m2 += d * (x - mean)
+        if i >= window:
+            y = arr[i - window]
+            if np.isnan(y):
+                nan_count -= 1
+            else:
+                count -= 1
+                if count == 0:
+                    # Exact reset - no drift carried into the next window
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    d = y - mean
+                    mean -= d / count
+                    m2 -= (y - mean) * d
+        if i >= window - 1 and nan_count == 0 and window > 1:
+            out[i] = np.sqrt(m2 / (window - 1)) if m2 > 0.0 else 0.0
+    return out
+
+
+@njit(cache=True)
+def rolling_mean_std(arr, window):
+    """Fused rolling mean and sample std - reads the column once
+
+    Shares one set of Welford running moments per window, so the mean comes
+    for free and the std avoids sum-of-squares cancellation.
+    """
+    n = arr.shape[0]
+    mean_out = np.full(n, np.nan)
+    std_out = np.full(n, np.nan)
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    nan_count = 0
+    for i in range(n):
+        x = arr[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            count += 1
+            d = x - mean
+            mean += d / count
+            m2 += d * (x - mean)
+        if i >= window:
+            y = arr[i - window]
+            if np.isnan(y):
+                nan_count -= 1
+            else:
+                count -= 1
+                if count == 0:
+                    # Exact reset - no drift carried into the next window
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    d = y - mean
+                    mean -= d / count
+                    m2 -= (y - mean) * d
+        if i >= window - 1 and nan_count == 0:
+            mean_out[i] = mean
+            # Sample std is undefined for a single observation (ddof=1,
+            # matching pandas) - leave NaN rather than divide by zero
+            if window > 1:
+                std_out[i] = np.sqrt(m2 / (window - 1)) if m2 > 0.0 else 0.0
+    return mean_out, std_out
+
+
+@njit(cache=True)
+def rolling_min(arr, window):
+    """Rolling minimum over each full window"""
+    n = arr.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        m = arr[i - window + 1]
+        for j in range(i - window + 2, i + 1):
+            x = arr[j]
+            if np.isnan(x) or np.isnan(m):
+                m = np.nan
+                break
+            if x < m:
+                m = x
+        out[i] = m
+    return out
+
+
+@njit(cache=True)
+def rolling_max(arr, window):
+    """Rolling maximum over each full window"""
+    n = arr.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        m = arr[i - window + 1]
+        for j in range(i - window + 2, i + 1):
+            x = arr[j]
+            if np.isnan(x) or np.isnan(m):
+                m = np.nan
+                break
+            if x > m:
+                m = x
+        out[i] = m
+    return out
+
+
+@njit(cache=True, parallel=True)
+def rolling_mean_table(arr2d, window):
+    """Table-wise rolling mean - columns computed in parallel"""
+    n, n_cols = arr2d.shape
+    out = np.empty((n, n_cols))
+    for j in prange(n_cols):
+        out[:, j] = rolling_mean(arr2d[:, j], window)
+    return out
+
+
+@njit(cache=True, parallel=True)
+def rolling_std_table(arr2d, window):
+    """Table-wise rolling sample std - columns computed in parallel"""
+    n, n_cols = arr2d.shape
+    out = np.empty((n, n_cols))
+    for j in prange(n_cols):
+        out[:, j] = rolling_std(arr2d[:, j], window)
+    return out
+
+
+@njit(cache=True, parallel=True)
+def rolling_mean_std_table(arr2d, window):
+    """Table-wise fused rolling mean and std - columns computed in parallel"""
+    n, n_cols = arr2d.shape
+    mean_out = np.empty((n, n_cols))
+    std_out = np.empty((n, n_cols))
+    for j in prange(n_cols):
+        col_mean, col_std = rolling_mean_std(arr2d[:, j], window)
+        mean_out[:, j] = col_mean
+        std_out[:, j] = col_std
+    return mean_out, std_out
+
+
+@njit(cache=True, parallel=True)
+def rolling_min_table(arr2d, window):
+    """Table-wise rolling minimum - columns computed in parallel"""
+    n, n_cols = arr2d.shape
+    out = np.empty((n, n_cols))
+    for j in prange(n_cols):
+        out[:, j] = rolling_min(arr2d[:, j], window)
+    return out
+
+
+@njit(cache=True, parallel=True)
+def rolling_max_table(arr2d, window):
+    """Table-wise rolling maximum - columns computed in parallel"""
+    n, n_cols = arr2d.shape
+    out = np.empty((n, n_cols))
+    for j in prange(n_cols):
+        out[:, j] = rolling_max(arr2d[:, j], window)
+    return out
+
+
+def warmup_kernels():
+    """Trigger JIT compilation of every kernel on tiny inputs
+
+    Called at application startup so the first real request doesn't pay the
+    multi-second compile cost; @njit(cache=True) persists the compiled code
+    across process restarts.
+    """
+    arr = np.arange(16, dtype=np.float64)
+    # Fortran order to match the np.asfortranarray blocks the feature
+    # engineering path passes in - Numba specializes on memory layout
+    arr2d = np.asfortranarray(arr.reshape(8, 2))
+    for kernel in (rolling_mean, rolling_std, rolling_min, rolling_max,
+                   rolling_mean_std):
+        kernel(arr, 3)
+    for kernel in (rolling_mean_table, rolling_std_table,
+                   rolling_min_table, rolling_max_table,
+                   rolling_mean_std_table):
+        kernel(arr2d, 3)